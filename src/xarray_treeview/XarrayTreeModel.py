@@ -2,6 +2,9 @@
 """
 
 from __future__ import annotations
+from collections.abc import Iterator
+import re
+from functools import lru_cache
 from qtpy.QtCore import *
 from qtpy.QtGui import *
 from qtpy.QtWidgets import *
@@ -11,7 +14,95 @@ import xarray as xr
 from datatree import DataTree
 
 
+# indented block of lines following the Coordinates: or Data variables: header in a dataset repr
+# (the header is followed by e.g. (12/20) when xarray only shows some of the arrays)
+_ARRAYS_SECTION_RE = re.compile(r'^(?:Coordinates|Data variables):(?: \(\d+/\d+\))?\n((?: .*(?:\n|$))*)', re.MULTILINE)
+
+# name, optional (dims), dtype, bytes, details
+# names are filled in with the known var/coord names, as they may contain spaces
+_ARRAY_DETAILS_PATTERN = r'^ {{2}}[ *] ({names}) +(?:\([^)]*\) +)?\S+ +\S+ +(.*)$'
+
+# roles provided by XarrayTreeModel.data
+_DATA_ROLES: frozenset[Qt.ItemDataRole] = frozenset([Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole, Qt.ItemDataRole.DecorationRole])
+
+# icon name for each data type
+_ICON_NAMES: dict[str, str] = {
+    'node': 'ph.folder-thin',
+    'var': 'ph.cube-thin',
+    'coord': 'ph.list-numbers-thin',
+}
+
+# icons are created on first use (they require a QApplication) and then shared
+_ICONS: dict[str, QIcon] = {}
+
+
+def _icon(data_type: str) -> QIcon | None:
+    """ Get the cached icon for data_type.
+    """
+    icon: QIcon | None = _ICONS.get(data_type)
+    if icon is None:
+        name: str | None = _ICON_NAMES.get(data_type)
+        if name is None:
+            return None
+        icon = _ICONS[data_type] = qta.icon(name)
+    return icon
+
+
+@lru_cache(maxsize=128)
+def _parseDatasetDetails(text: str, names: tuple[str, ...]) -> dict[str, str]:
+    """ Parse {key: details} for the vars/coords with the given names from a dataset repr.
+
+    Arrays that xarray leaves out of a long repr are not included.
+    Cached by repr so that nodes with identical datasets share the result (do not modify the returned dict).
+    """
+    details: dict[str, str] = {}
+    if not names:
+        return details
+    details_re: re.Pattern = re.compile(_ARRAY_DETAILS_PATTERN.format(names='|'.join(map(re.escape, names))), re.MULTILINE)
+    for section in _ARRAYS_SECTION_RE.findall(text):
+        details.update(details_re.findall(section))
+    return details
+
+
+class StrTask(QRunnable):
+    """ Compute str(obj) in a QThreadPool thread and emit signals.finished(text, key).
+
+    Connect signals.finished to a slot of a QObject living in the GUI thread so the result is delivered there.
+    obj is shallow copied on construction (i.e., in the calling thread), so later edits to it do not race with str(obj).
+    Call cancel() if the result is no longer needed.
+    """
+
+    class Signals(QObject):
+        finished = Signal(str, str)
+
+    def __init__(self, obj: DataTree | xr.Dataset | xr.DataArray, key: str = '') -> None:
+        QRunnable.__init__(self)
+        self._obj = obj.copy(deep=False)
+        if isinstance(obj, DataTree) and (obj.parent is not None):
+            # the copy is detached from its parent, so give it a stand-in parent for the DataTree('name', parent="...") header
+            self._obj.parent = DataTree(name=obj.parent.name)
+        self._key = key
+        self._isCancelled = False
+        self.signals = StrTask.Signals()
+    
+    def cancel(self) -> None:
+        """ Skip the work (if not yet started) and the finished signal.
+        """
+        self._isCancelled = True
+    
+    def run(self) -> None:
+        if self._isCancelled:
+            return
+        text: str = str(self._obj)
+        if self._isCancelled:
+            return
+        self.signals.finished.emit(text, self._key)
+
+
 class XarrayTreeModel(AbstractTreeModel):
+
+    # emitted with (path, text) in response to requestReprAtPath
+    sigReprReady = Signal(str, str)
     
     def __init__(self, dt: DataTree = None, parent: QObject = None):
         AbstractTreeModel.__init__(self, parent=parent)
@@ -19,6 +110,42 @@ class XarrayTreeModel(AbstractTreeModel):
         # optional details column
         self._isDetailsColumnVisible = True
 
+        # optionally show vars and coords
+        self._isVariablesVisible = True
+        self._isCoordinatesVisible = True
+
+        # cached {key: details} for the vars/coords of each node, keyed by node path
+        self._detailsCache: dict[str, dict[str, str]] = {}
+
+        # cached str() of each node's dataset and of each var/coord, keyed by path
+        self._reprCache: dict[str, str] = {}
+
+        # reprs being built in worker threads, {path: cache generation when requested}
+        # the generation is bumped whenever cached data is invalidated, so stale results can be discarded
+        self._reprRequests: dict[str, int] = {}
+        self._cacheGeneration: int = 0
+
+        # cached sizes string of each node, keyed by node path
+        self._sizesCache: dict[str, str] = {}
+
+        # node items whose children have not been built yet
+        self._unfetchedItems: set[AbstractTreeItem] = set()
+
+        # cached path of each item
+        self._pathCache: dict[AbstractTreeItem, str] = {}
+
+        # cached row of each item within its parent
+        self._rowCache: dict[AbstractTreeItem, int] = {}
+
+        # (parent, children) of the parents whose children are being inserted/removed/moved (see beginInsertRows, etc.)
+        self._changedRowParents: list[tuple[AbstractTreeItem, list[AbstractTreeItem]]] = []
+
+        # cached data type ('node', 'var' or 'coord') of each item, keyed by item path
+        self._dataTypeCache: dict[str, str | None] = {}
+
+        # cached names of the child nodes, vars and coords of each node, keyed by node path
+        self._namesCache: dict[str, frozenset[str]] = {}
+
         # column labels
         self.setColumnLabels(['DataTree', 'Details'])
 
@@ -30,60 +157,484 @@ class XarrayTreeModel(AbstractTreeModel):
     
     def setDataTree(self, dt: DataTree | None, include_vars: bool = True, include_coords: bool = True) -> None:
         self._dataTree = dt
+        self._isVariablesVisible = include_vars
+        self._isCoordinatesVisible = include_coords
+        self._invalidateCaches()
+        self._unfetchedItems.clear()
         if dt is None:
             root = AbstractTreeItem()
             self.setRoot(root)
             return
+        # only the top level is built here, child nodes are populated on demand (see fetchMore)
         root_item: AbstractTreeItem = AbstractTreeItem(name=dt.name, parent=None)
-        for node in dt.subtree:
-            if node is not dt:
-                # node item
-                parent_item: AbstractTreeItem = self.itemFromPath(node.parent.path, root=root_item)
-                AbstractTreeItem(name=node.name, parent=parent_item)
-            if include_vars:
-                for key in list(node.ds.data_vars):
-                    # var item
-                    parent_item: AbstractTreeItem = self.itemFromPath(node.path, root=root_item)
-                    AbstractTreeItem(name=key, parent=parent_item)
-            if include_coords:
-                for key in list(node.ds.coords):
-                    # coord item
-                    parent_item: AbstractTreeItem = self.itemFromPath(node.path, root=root_item)
-                    AbstractTreeItem(name=key, parent=parent_item)
+        self._appendChildItems(root_item, dt)
         # set item tree
         self.setRoot(root_item)
     
+    def setRoot(self, root: AbstractTreeItem) -> None:
+        self._pathCache.clear()
+        self._rowCache.clear()
+        AbstractTreeModel.setRoot(self, root)
+    
+    def indexFromItem(self, item: AbstractTreeItem) -> QModelIndex:
+        """ Get the index associated with item.
+
+        Uses cached rows instead of searching the parent's children for item (see AbstractTreeItem.sibling_index).
+        """
+        parent_item: AbstractTreeItem | None = item.parent
+        if (item is self.root()) or (parent_item is None):
+            return QModelIndex()
+        row: int | None = self._rowCache.get(item)
+        if row is None:
+            # cache the rows of all siblings at once
+            for i, child in enumerate(parent_item.children):
+                self._rowCache[child] = i
+            row = self._rowCache[item]
+        return self.createIndex(row, 0, item)
+    
+    def _invalidateRows(self, parent_index: QModelIndex) -> None:
+        """ Clear the cached rows of the children of parent_index.
+        """
+        for child in self.itemFromIndex(parent_index).children:
+            self._rowCache.pop(child, None)
+    
+    def _invalidateChangedRows(self) -> None:
+        """ Clear the cached rows of the children (before and after the change) of the parents recorded by the last begin*Rows call.
+
+        Views query indexes while rowsAboutToBe* is emitted, so rows are cached again before the children change.
+        """
+        for parent_item, children in self._changedRowParents:
+            for child in children + parent_item.children:
+                self._rowCache.pop(child, None)
+        self._changedRowParents = []
+    
+    def _recordChangedRows(self, *parent_indexes: QModelIndex) -> None:
+        """ Remember the parents (and their current children) whose rows are about to change.
+        """
+        items: list[AbstractTreeItem] = [self.itemFromIndex(parent_index) for parent_index in parent_indexes]
+        self._changedRowParents = [(item, list(item.children)) for item in items]
+    
+    def beginInsertRows(self, parent_index: QModelIndex, first: int, last: int) -> None:
+        self._invalidateRows(parent_index)
+        self._recordChangedRows(parent_index)
+        AbstractTreeModel.beginInsertRows(self, parent_index, first, last)
+    
+    def endInsertRows(self) -> None:
+        self._invalidateChangedRows()
+        AbstractTreeModel.endInsertRows(self)
+    
+    def beginRemoveRows(self, parent_index: QModelIndex, first: int, last: int) -> None:
+        self._invalidateRows(parent_index)
+        self._recordChangedRows(parent_index)
+        AbstractTreeModel.beginRemoveRows(self, parent_index, first, last)
+    
+    def endRemoveRows(self) -> None:
+        self._invalidateChangedRows()
+        AbstractTreeModel.endRemoveRows(self)
+    
+    def beginMoveRows(self, src_parent_index: QModelIndex, src_first: int, src_last: int, dst_parent_index: QModelIndex, dst_row: int) -> bool:
+        self._invalidateRows(src_parent_index)
+        self._invalidateRows(dst_parent_index)
+        self._recordChangedRows(src_parent_index, dst_parent_index)
+        return AbstractTreeModel.beginMoveRows(self, src_parent_index, src_first, src_last, dst_parent_index, dst_row)
+    
+    def endMoveRows(self) -> None:
+        self._invalidateChangedRows()
+        AbstractTreeModel.endMoveRows(self)
+    
+    def depthFirst(self, item: AbstractTreeItem | None = None) -> Iterator[AbstractTreeItem]:
+        """ Iterate over item (default root) and its descendants in depth-first order.
+
+        Unlike AbstractTreeItem.depth_first, this uses an explicit stack rather than sibling lookups (each a search of the parent's children).
+        Children are read after their parent is yielded, so items fetched during iteration are also visited.
+        """
+        if item is None:
+            item = self.root()
+        stack: list[AbstractTreeItem] = [item]
+        while stack:
+            item = stack.pop()
+            yield item
+            stack.extend(reversed(item.children))
+    
+    def pathFromItem(self, item: AbstractTreeItem) -> str:
+        """ Build the path from the chain of item names up to root.
+
+        Paths are cached per item and built from the cached parent path.
+        """
+        path: str | None = self._pathCache.get(item)
+        if path is not None:
+            return path
+        if item.parent is None:
+            path = '/'
+        else:
+            path = self.pathFromItem(item.parent).rstrip('/') + '/' + item.name
+        self._pathCache[item] = path
+        return path
+    
+    def itemFromPath(self, path: str, root: AbstractTreeItem = None) -> AbstractTreeItem | None:
+        """ Find the item associated with path from root.
+
+        Unfetched ancestors of the item are fetched along the way.
+        """
+        if root is None:
+            root = self.root()
+        item: AbstractTreeItem = root
+        for name in path.strip('/').split('/'):
+            if not name:
+                continue
+            if item in self._unfetchedItems:
+                self.fetchMore(self.indexFromItem(item))
+            for child in item.children:
+                if child.name == name:
+                    item = child
+                    break
+            else:
+                return None
+        return item
+    
+    def indexFromPath(self, path: str) -> QModelIndex:
+        """ Get the index associated with path (invalid if there is no such item).
+        """
+        item: AbstractTreeItem | None = self.itemFromPath(path)
+        if item is None:
+            return QModelIndex()
+        return self.indexFromItem(item)
+    
     def dataTypeAtPath(self, path: str) -> str | None:
         """ Get the data type associated with path.
+
+        This is queried for every row on every repaint, so the result is cached per path.
         """
+        if path in self._dataTypeCache:
+            return self._dataTypeCache[path]
         dt: DataTree | None = self.dataTree()
         if dt is None:
             return
+        data_type: str | None = None
         obj: DataTree | xr.DataArray | None = dt[path]
         if isinstance(obj, DataTree):
-            return 'node'
-        if isinstance(obj, xr.DataArray):
+            data_type = 'node'
+        elif isinstance(obj, xr.DataArray):
             parent_path = '/'.join(path.rstrip('/').split('/')[:-1])
             node: DataTree = dt[parent_path]
             if node is not None:
-                if obj.name in list(node.ds.data_vars):
-                    return 'var'
-                if obj.name in list(node.ds.coords):
-                    return 'coord'
+                ds: xr.Dataset = node.ds
+                if obj.name in ds.data_vars:
+                    data_type = 'var'
+                elif obj.name in ds.coords:
+                    data_type = 'coord'
+        self._dataTypeCache[path] = data_type
+        return data_type
+    
+    def namesAtPath(self, path: str) -> frozenset[str]:
+        """ Get the names of all child nodes, vars and coords of the node at path.
+
+        Includes vars and coords that are not shown in the tree.
+        """
+        names: frozenset[str] | None = self._namesCache.get(path)
+        if names is not None:
+            return names
+        dt: DataTree | None = self.dataTree()
+        if dt is None:
+            return frozenset()
+        node: DataTree = dt[path]
+        names = frozenset(node.children) | frozenset(node.ds.variables)
+        self._namesCache[path] = names
+        return names
+    
+    def reprAtPath(self, path: str) -> str:
+        """ Get str() of the dataset of the node at path, or of the var/coord at path.
+
+        Cached until the data is changed via the model (e.g., setData, setAttrsAtPath) or the data tree is reset (e.g., XarrayTreeView.refresh).
+        Changes made directly to the data tree are not seen until then.
+        """
+        text: str | None = self._reprCache.get(path)
+        if text is not None:
+            return text
+        dt: DataTree | None = self.dataTree()
+        if dt is None:
+            return ''
+        obj: DataTree | xr.DataArray = dt[path]
+        if isinstance(obj, DataTree):
+            # same as the snapshot taken by requestReprAtPath, so the text does not depend on which built it
+            text = str(obj.to_dataset())
+        elif isinstance(obj, xr.DataArray):
+            text = str(obj)
+        else:
+            text = ''
+        self._reprCache[path] = text
+        return text
+    
+    def requestReprAtPath(self, path: str) -> None:
+        """ Emit sigReprReady(path, text) with the repr at path (see reprAtPath).
+
+        If it is not cached, the repr is built in a QThreadPool thread so the GUI does not block on large datasets.
+        """
+        text: str | None = self._reprCache.get(path)
+        if text is not None:
+            self.sigReprReady.emit(path, text)
+            return
+        if self._reprRequests.get(path) == self._cacheGeneration:
+            # already being built
+            return
+        dt: DataTree | None = self.dataTree()
+        if dt is None:
+            return
+        try:
+            obj: DataTree | xr.DataArray = dt[path]
+        except KeyError:
+            return
+        if isinstance(obj, DataTree):
+            obj = obj.to_dataset()
+        self._reprRequests[path] = self._cacheGeneration
+        task = StrTask(obj, path)
+        task.signals.finished.connect(self._onReprTaskFinished)
+        QThreadPool.globalInstance().start(task)
+    
+    def _onReprTaskFinished(self, text: str, path: str) -> None:
+        generation: int | None = self._reprRequests.pop(path, None)
+        if generation != self._cacheGeneration:
+            # data changed while the repr was being built
+            self.requestReprAtPath(path)
+            return
+        self._reprCache[path] = text
+        self.sigReprReady.emit(path, text)
+    
+    def setAttrsAtPath(self, path: str, attrs: dict) -> None:
+        """ Set the attrs of the node or var/coord at path.
+        """
+        dt: DataTree | None = self.dataTree()
+        if dt is None:
+            return
+        obj: DataTree | xr.DataArray = dt[path]
+        obj.attrs = attrs
+        if isinstance(obj, DataTree):
+            self._invalidateCaches(path)
+        else:
+            self._invalidateCaches('/'.join(path.rstrip('/').split('/')[:-1]) or '/')
+    
+    def detailsAtPath(self, path: str) -> dict[str, str]:
+        """ Get the details strings for the vars/coords of the node at path.
+
+        The dataset repr is parsed in a single pass and cached per node
+        so that repainting the details column does not rebuild it for every var/coord.
+        Cached in the same way as reprAtPath.
+        """
+        details: dict[str, str] | None = self._detailsCache.get(path)
+        if details is not None:
+            return details
+        dt: DataTree | None = self.dataTree()
+        if dt is None:
+            return {}
+        names: tuple[str, ...] = tuple(str(name) for name in dt[path].ds.variables)
+        details = _parseDatasetDetails(self.reprAtPath(path), names)
+        self._detailsCache[path] = details
+        return details
+    
+    def sizesAtPath(self, path: str) -> str:
+        """ Get the '(dim: size, ...)' string for the node at path.
+        """
+        sizes: str | None = self._sizesCache.get(path)
+        if sizes is not None:
+            return sizes
+        dt: DataTree | None = self.dataTree()
+        if dt is None:
+            return ''
+        node: DataTree = dt[path]
+        sizes = '(' + ', '.join([f'{dim}: {size}' for dim, size in node.ds.sizes.items()]) + ')'
+        self._sizesCache[path] = sizes
+        return sizes
+    
+    def _invalidateCaches(self, path: str | None = None) -> None:
+        """ Clear cached data for the node at path, or for all nodes if path is None.
+        """
+        self._cacheGeneration += 1
+        if path is None:
+            self._pathCache.clear()
+            self._reprCache.clear()
+            self._detailsCache.clear()
+            self._sizesCache.clear()
+            self._namesCache.clear()
+            self._dataTypeCache.clear()
+            return
+        self._reprCache.pop(path, None)
+        self._detailsCache.pop(path, None)
+        self._sizesCache.pop(path, None)
+        self._namesCache.pop(path, None)
+        # data types and reprs of the node's vars/coords/child nodes
+        prefix: str = path.rstrip('/') + '/'
+        for cache in (self._dataTypeCache, self._reprCache):
+            for key in [key for key in cache if key.startswith(prefix) and '/' not in key[len(prefix):]]:
+                del cache[key]
+    
+    def _childItemCount(self, node: DataTree) -> int:
+        """ Number of items that _appendChildItems would append for node.
+        """
+        ds: xr.Dataset = node.ds
+        count: int = len(node.children)
+        if self._isVariablesVisible:
+            count += len(ds.data_vars)
+        if self._isCoordinatesVisible:
+            count += len(ds.coords)
+        return count
+    
+    def _appendChildItems(self, parent_item: AbstractTreeItem, node: DataTree) -> None:
+        """ Append var, coord and child node items (in that order) for node to the childless parent_item.
+
+        Child node items are left unpopulated until they are fetched.
+        """
+        node_path: str = node.path
+        self._dataTypeCache[node_path] = 'node'
+        ds: xr.Dataset = node.ds
+        data_types: list[tuple[str, str]] = []
+        if self._isVariablesVisible:
+            data_types += [(key, 'var') for key in ds.data_vars]
+        if self._isCoordinatesVisible:
+            data_types += [(key, 'coord') for key in ds.coords]
+        data_types += [(name, 'node') for name in node.children]
+        # we already know the data type of each item, so cache it while building the tree
+        prefix: str = node_path.rstrip('/') + '/'
+        self._dataTypeCache.update((prefix + name, data_type) for name, data_type in data_types)
+        items: list[AbstractTreeItem] = [AbstractTreeItem(name=name, parent=parent_item) for name, _ in data_types]
+        self._unfetchedItems.update(item for item, (_, data_type) in zip(items, data_types) if data_type == 'node')
+    
+    def hasChildren(self, parent_index: QModelIndex = QModelIndex()) -> bool:
+        if parent_index.column() > 0:
+            return False
+        item: AbstractTreeItem = self.itemFromIndex(parent_index)
+        if item in self._unfetchedItems:
+            # report children without building them
+            dt: DataTree | None = self.dataTree()
+            if dt is None:
+                return False
+            return self._childItemCount(dt[self.pathFromItem(item)]) > 0
+        return AbstractTreeModel.hasChildren(self, parent_index)
+    
+    def canFetchMore(self, parent_index: QModelIndex) -> bool:
+        if parent_index.column() > 0:
+            return False
+        return self.itemFromIndex(parent_index) in self._unfetchedItems
+    
+    def fetchMore(self, parent_index: QModelIndex) -> None:
+        """ Build the child items of a node item the first time they are needed.
+        """
+        item: AbstractTreeItem = self.itemFromIndex(parent_index)
+        if item not in self._unfetchedItems:
+            return
+        self._unfetchedItems.discard(item)
+        dt: DataTree | None = self.dataTree()
+        if dt is None:
+            return
+        node: DataTree = dt[self.pathFromItem(item)]
+        count: int = self._childItemCount(node)
+        if count == 0:
+            return
+        self.beginInsertRows(parent_index, 0, count - 1)
+        self._appendChildItems(item, node)
+        self.endInsertRows()
+    
+    def maxDepth(self) -> int:
+        """ Max depth of the item tree including items that have not been fetched yet.
+        """
+        dt: DataTree | None = self.dataTree()
+        if dt is None:
+            return 0
+        max_depth: int = 0
+        for node in dt.subtree:
+            depth: int = node.level - dt.level
+            ds: xr.Dataset = node.ds
+            if (self._isVariablesVisible and ds.data_vars) or (self._isCoordinatesVisible and ds.coords):
+                depth += 1
+            max_depth = max(max_depth, depth)
+        return max_depth
     
     def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
-        if self.isDetailsColumnVisible():
-            return 2
-        return 1
+        # called very often by the view, so read the flag directly
+        return 2 if self._isDetailsColumnVisible else 1
 
     def isDetailsColumnVisible(self) -> bool:
         return self._isDetailsColumnVisible
     
     def setDetailsColumnVisible(self, visible: bool) -> None:
+        if self._isDetailsColumnVisible == visible:
+            return
         self.beginResetModel()
         self._isDetailsColumnVisible = visible
         self.endResetModel()
     
+    def isVariablesVisible(self) -> bool:
+        return self._isVariablesVisible
+    
+    def setVariablesVisible(self, visible: bool) -> None:
+        if self._isVariablesVisible == visible:
+            return
+        self._isVariablesVisible = visible
+        self._setArrayItemsVisible('var', visible)
+    
+    def isCoordinatesVisible(self) -> bool:
+        return self._isCoordinatesVisible
+    
+    def setCoordinatesVisible(self, visible: bool) -> None:
+        if self._isCoordinatesVisible == visible:
+            return
+        self._isCoordinatesVisible = visible
+        self._setArrayItemsVisible('coord', visible)
+    
+    def _setArrayItemsVisible(self, data_type: str, visible: bool) -> None:
+        """ Insert or remove the var or coord items of every node.
+
+        Only the affected rows are inserted/removed, so the rest of the item tree
+        (and the view's expanded/selected state) is left untouched.
+        """
+        dt: DataTree | None = self.dataTree()
+        if dt is None:
+            return
+        root: AbstractTreeItem = self.root()
+        # unfetched node items will be built with the new visibility when fetched
+        node_items: list[AbstractTreeItem] = [item for item in self.depthFirst(root) if (item not in self._unfetchedItems) and self.dataTypeAtPath(self.pathFromItem(item)) == 'node']
+        for node_item in node_items:
+            node_path: str = self.pathFromItem(node_item)
+            parent_index: QModelIndex = self.indexFromItem(node_item)
+            if visible:
+                # vars come first, then coords, then child nodes
+                node: DataTree = dt[node_path]
+                if data_type == 'var':
+                    keys = list(node.ds.data_vars)
+                    row = 0
+                elif data_type == 'coord':
+                    keys = list(node.ds.coords)
+                    row = len([child for child in node_item.children if self.dataTypeAtPath(self.pathFromItem(child)) == 'var'])
+                if keys:
+                    prefix: str = node_path.rstrip('/') + '/'
+                    self._dataTypeCache.update((prefix + key, data_type) for key in keys)
+                    self._insertChildItems(row, [AbstractTreeItem(name=key) for key in keys], parent_index)
+            else:
+                rows = [row for row, child in enumerate(node_item.children) if self.dataTypeAtPath(self.pathFromItem(child)) == data_type]
+                for row in rows:
+                    self._pathCache.pop(node_item.children[row], None)
+                # remove contiguous runs of rows starting from the end
+                while rows:
+                    last = first = rows.pop()
+                    while rows and rows[-1] == first - 1:
+                        first = rows.pop()
+                    # only remove the items, not the data
+                    AbstractTreeModel.removeRows(self, first, last - first + 1, parent_index)
+    
+    def _insertChildItems(self, row: int, items: list[AbstractTreeItem], parent_index: QModelIndex) -> None:
+        """ Insert items at row under parent_index without touching the data tree.
+
+        Same as AbstractTreeModel.insertItems, but moves the appended items into place in one step
+        instead of one insert_child call (each a search of the children list) per item.
+        """
+        parent_item: AbstractTreeItem = self.itemFromIndex(parent_index)
+        self.beginInsertRows(parent_index, row, row + len(items) - 1)
+        for item in items:
+            # appends item to the parent's children
+            item.parent = parent_item
+        children: list[AbstractTreeItem] = parent_item.children
+        children[:] = children[:row] + items + children[row:-len(items)]
+        self.endInsertRows()
+    
     def flags(self, index: QModelIndex) -> Qt.ItemFlag:
         if not index.isValid():
             # root item
@@ -91,24 +642,26 @@ class XarrayTreeModel(AbstractTreeModel):
                 # allow drops on the root item (i.e., this allows drops on the viewport away from other items)
                 return Qt.ItemFlag.ItemIsDropEnabled
             return Qt.ItemFlag.NoItemFlags
-        path: str = self.pathFromIndex(index)
-        data_type: str | None = self.dataTypeAtPath(path)
         if index.column() == 0:
             flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEditable
-        elif index.column() == 1:
+        else:
             # cannot edit details column
             flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
         # drag and drop
-        if self.supportedDropActions() != Qt.DropAction.IgnoreAction:
-            if data_type == 'node':
-                # can only drag and drop node items
-                flags |= (Qt.ItemFlag.ItemIsDragEnabled | Qt.ItemFlag.ItemIsDropEnabled)
+        if self.supportedDropActions() == Qt.DropAction.IgnoreAction:
+            # no need to look up the data type
+            return flags
+        if self.dataTypeAtPath(self.pathFromIndex(index)) == 'node':
+            # can only drag and drop node items
+            flags |= (Qt.ItemFlag.ItemIsDragEnabled | Qt.ItemFlag.ItemIsDropEnabled)
         return flags
 
     def data(self, index: QModelIndex, role: int):
+        # views query many roles per cell (size hint, font, tooltip, ...), bail out early for the ones we don't provide
+        if role not in _DATA_ROLES:
+            return
         if not index.isValid():
             return
-        dt: DataTree | None = self.dataTree()
         if role == Qt.ItemDataRole.DisplayRole or role == Qt.ItemDataRole.EditRole:
             item: AbstractTreeItem = self.itemFromIndex(index)
             if index.column() == 0:
@@ -117,39 +670,15 @@ class XarrayTreeModel(AbstractTreeModel):
                 path: str = self.pathFromIndex(index)
                 data_type: str | None = self.dataTypeAtPath(path)
                 if data_type == 'node':
-                    node: DataTree = dt[path]
-                    sizes = node.ds.sizes
-                    return '(' + ', '.join([f'{dim}: {size}' for dim, size in sizes.items()]) + ')'
-                if data_type == 'var':
-                    node: DataTree = dt[self.pathFromItem(item.parent)]
-                    rep = str(node.ds)
-                    i = rep.find('Data variables:')
-                    i = rep.find(item.name, i)  # find var
-                    i = rep.find(') ', i) + 2  # skip dimensions
-                    i = rep.find(' ', i) + 1  # skip dtype
-                    i = rep.find(' ', i) + 1  # skip bytes
-                    j = rep.find('\n', i)
-                    return rep[i:j] if j > 0 else rep[i:]
-                if data_type == 'coord':
-                    node: DataTree = dt[self.pathFromItem(item.parent)]
-                    rep = str(node.ds)
-                    i = rep.find('Coordinates:')
-                    i = rep.find(item.name, i)  # find coord
-                    i = rep.find(') ', i) + 2  # skip dimensions
-                    i = rep.find(' ', i) + 1  # skip dtype
-                    i = rep.find(' ', i) + 1  # skip bytes
-                    j = rep.find('\n', i)
-                    return rep[i:j] if j > 0 else rep[i:]
+                    return self.sizesAtPath(path)
+                if data_type in ['var', 'coord']:
+                    return self.detailsAtPath(self.pathFromItem(item.parent)).get(item.name, '')
         if role == Qt.ItemDataRole.DecorationRole:
             if index.column() == 0:
                 path: str = self.pathFromIndex(index)
                 data_type: str | None = self.dataTypeAtPath(path)
-                if data_type == 'node':
-                    return qta.icon('ph.folder-thin')
-                if data_type == 'var':
-                    return qta.icon('ph.cube-thin')
-                if data_type == 'coord':
-                    return qta.icon('ph.list-numbers-thin')
+                if data_type is not None:
+                    return _icon(data_type)
 
     def setData(self, index: QModelIndex, value, role: int) -> bool:
         if role == Qt.ItemDataRole.EditRole:
@@ -159,8 +688,8 @@ class XarrayTreeModel(AbstractTreeModel):
                 new_name: str = value
                 if new_name == old_name:
                     return False
-                sibling_names = [child.name for child in item.parent.children]
-                if new_name in sibling_names:
+                parent_path: str = self.pathFromItem(item.parent)
+                if new_name in self.namesAtPath(parent_path):
                     QMessageBox.warning(None, 'Name already exists', f'Name "{new_name}" already exists in parent node.')
                     return False
                 path: str = self.pathFromIndex(index)
@@ -175,14 +704,21 @@ class XarrayTreeModel(AbstractTreeModel):
                     node.orphan()
                     node.name = new_name
                     node.parent = parent_node
+                    self._invalidateCaches()
                     item.name = new_name
-                    return True
                 elif data_type in ['var', 'coord']:
                     # rename array
-                    node: DataTree = dt[self.pathFromItem(item.parent)]
-                    node.ds = node.to_dataset().rename_vars({old_name: new_name})
+                    node: DataTree = dt[parent_path]
+                    node.ds = node.ds.rename_vars({old_name: new_name})
+                    self._invalidateCaches(parent_path)
+                    self._pathCache.pop(item, None)
                     item.name = new_name
-                    return True
+                else:
+                    return False
+                # single notification spanning the whole row (name and details)
+                last_index: QModelIndex = self.sibling(index.row(), self.columnCount() - 1, index)
+                self.dataChanged.emit(index, last_index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+                return True
         return False
     
     def removeRows(self, row: int, count: int, parent_index: QModelIndex = QModelIndex()) -> bool:
@@ -195,6 +731,7 @@ class XarrayTreeModel(AbstractTreeModel):
         # remove items
         success: bool = AbstractTreeModel.removeRows(self, row, count, parent_index)
         if success:
+            self._pathCache.clear()
             # remove data
             dt: DataTree = self.dataTree()
             if dt is not None:
@@ -202,11 +739,13 @@ class XarrayTreeModel(AbstractTreeModel):
                     obj: DataTree | xr.DataArray = dt[path]
                     if isinstance(obj, DataTree):
                         obj.orphan()
+                        self._invalidateCaches()
                     elif isinstance(obj, xr.DataArray):
                         obj_name = path.rstrip('/').split('/')[-1]
-                        parent_path = '/'.join(path.rstrip('/').split('/')[:-1])
+                        parent_path = '/'.join(path.rstrip('/').split('/')[:-1]) or '/'
                         node: DataTree = dt[parent_path]
-                        node.ds = node.to_dataset().drop_vars(obj_name)
+                        node.ds = node.ds.drop_vars(obj_name)
+                        self._invalidateCaches(parent_path)
         return success
     
     def moveRow(self, src_parent_index: QModelIndex, src_row: int, dst_parent_index: QModelIndex, dst_row: int) -> bool:
@@ -225,10 +764,18 @@ class XarrayTreeModel(AbstractTreeModel):
         src_node: DataTree = dt[src_path]
         dst_parent_node: DataTree = dt[dst_parent_path]
 
+        if self.canFetchMore(dst_parent_index):
+            # otherwise fetching the destination later would add the moved item a second time
+            n_dst_rows: int = self.rowCount(dst_parent_index)
+            self.fetchMore(dst_parent_index)
+            if dst_row == n_dst_rows:
+                # append after the fetched items (e.g., TreeView.dropEvent appends using the row count before fetching)
+                dst_row = self.rowCount(dst_parent_index)
+
         if src_parent_index != dst_parent_index:
             # If we are not rearranging children within the same parent node,
             # ensure there is not a name conflict.
-            if src_item.name in (list(dst_parent_node.children) + list(dst_parent_node.ds.data_vars) + list(dst_parent_node.ds.coords)):
+            if src_item.name in self.namesAtPath(dst_parent_path):
                 raise ValueError('Name already exists in destination parent.')
         
         # move item
@@ -237,6 +784,7 @@ class XarrayTreeModel(AbstractTreeModel):
             # move data
             src_node.orphan()
             src_node.parent = dst_parent_node
+            self._invalidateCaches()
         return success
     
     # def assignNode(self, node: DataTree, path: str):
@@ -10,6 +10,7 @@ import xarray as xr
 from datatree import DataTree
 from pyqt_ext.tree import AbstractTreeItem, TreeView, KeyValueTreeItem, KeyValueTreeModel, KeyValueTreeView
 from xarray_treeview import XarrayTreeModel
+from xarray_treeview.XarrayTreeModel import StrTask
 
 
 class XarrayTreeView(TreeView):
@@ -21,16 +22,19 @@ class XarrayTreeView(TreeView):
 
         self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
 
+        # all rows are single line text with a small icon, so skip per row height calculations
+        self.setUniformRowHeights(True)
+
         # optionally show vars and coords
         self._showVarsAction = QAction('Show Vars')
         self._showVarsAction.setCheckable(True)
         self._showVarsAction.setChecked(True)
-        self._showVarsAction.triggered.connect(self.refresh)
+        self._showVarsAction.triggered.connect(self.setVariablesVisible)
 
         self._showCoordsAction = QAction('Show Coords')
         self._showCoordsAction.setCheckable(True)
         self._showCoordsAction.setChecked(True)
-        self._showCoordsAction.triggered.connect(self.refresh)
+        self._showCoordsAction.triggered.connect(self.setCoordinatesVisible)
 
         # optional details column
         self._showDetailsColumnAction = QAction('Show Details Column')
@@ -38,6 +42,9 @@ class XarrayTreeView(TreeView):
         self._showDetailsColumnAction.setChecked(False)
         self._showDetailsColumnAction.triggered.connect(self.refresh)
 
+        self._refreshAction = QAction('Refresh')
+        self._refreshAction.triggered.connect(self.refresh)
+
         # these will appear in the item's context menu
         self._itemContextMenuFunctions: list[tuple[str, Callable[[AbstractTreeItem]]]] = [
             ('Info', lambda item, self=self: self.popupItemInfo(item)),
@@ -45,6 +52,12 @@ class XarrayTreeView(TreeView):
             ('Separator', None),
             ('Remove', lambda item, self=self: self.askToRemoveItem(item)),
         ]
+
+        # expanded items are tracked incrementally for storeState
+        # None means the expanded items are unknown and must be read from the view
+        self._expandedItems: set[AbstractTreeItem] | None = set()
+        self.expanded.connect(self._onExpanded)
+        self.collapsed.connect(self._onCollapsed)
     
     def setDataTree(self, dt: DataTree):
         show_vars = self._showVarsAction.isChecked()
@@ -55,9 +68,12 @@ class XarrayTreeView(TreeView):
             model = XarrayTreeModel()
             TreeView.setModel(self, model)
         self.storeState()
+        # repaint once after the model is rebuilt and the state restored
+        self.setUpdatesEnabled(False)
         model.setDataTree(dt, include_vars=show_vars, include_coords=show_coords)
         model.setDetailsColumnVisible(show_details)
         self.restoreState()
+        self.setUpdatesEnabled(True)
     
     def refresh(self):
         model: XarrayTreeModel = self.model()
@@ -72,6 +88,102 @@ class XarrayTreeView(TreeView):
         TreeView.setModel(self, model)
         self.refresh()
     
+    def expandAll(self):
+        TreeView.expandAll(self)
+        self._expandedItems = None
+    
+    def collapseAll(self):
+        TreeView.collapseAll(self)
+        self._expandedItems = set()
+    
+    def expandToDepth(self, depth: int):
+        TreeView.expandToDepth(self, depth)
+        self._expandedItems = None
+    
+    def _onExpanded(self, index: QModelIndex):
+        if self._expandedItems is not None:
+            self._expandedItems.add(self.model().itemFromIndex(index))
+    
+    def _onCollapsed(self, index: QModelIndex):
+        if self._expandedItems is not None:
+            self._expandedItems.discard(self.model().itemFromIndex(index))
+    
+    def storeState(self):
+        """ Store the paths of the expanded and selected items.
+
+        Expanded items are tracked as they are expanded/collapsed, so this does not need to walk the tree.
+        """
+        model: XarrayTreeModel = self.model()
+        if model is None:
+            return
+        root: AbstractTreeItem = model.root()
+        if (root is None) or not root.children:
+            return
+        if self._expandedItems is None:
+            # bulk expansion (e.g., expandAll) does not emit expanded, so resync from the view
+            self._expandedItems = {item for item in model.depthFirst(root) if (item is not root) and item.children and self.isExpanded(model.indexFromItem(item))}
+        expanded_paths: set[str] = set()
+        for item in self._expandedItems:
+            # skip items that were removed from the tree or collapsed by a model reset
+            if item.has_ancestor(root) and self.isExpanded(model.indexFromItem(item)):
+                expanded_paths.add(model.pathFromItem(item))
+        selected_paths: set[str] = {model.pathFromIndex(index) for index in self.selectionModel().selectedRows()}
+        self._state = {'expanded': expanded_paths, 'selected': selected_paths}
+
+    def restoreState(self):
+        """ Restore the expanded/selected state stored by storeState.
+
+        Only the stored paths (and their ancestors) are fetched, so the rest of the tree stays lazily loaded.
+        """
+        model: XarrayTreeModel = self.model()
+        if model is None:
+            return
+        if not hasattr(self, '_state'):
+            return
+        expanded_paths: set[str] = self._state['expanded']
+        selected_paths: set[str] = self._state['selected']
+        expanded_indexes: list[QModelIndex] = []
+        # parents before children
+        for path in sorted(expanded_paths, key=lambda path: path.count('/')):
+            # fetches the item's ancestors as needed
+            index: QModelIndex = model.indexFromPath(path)
+            if not index.isValid():
+                continue
+            if model.canFetchMore(index):
+                model.fetchMore(index)
+            expanded_indexes.append(index)
+        # leave updates off if the caller (e.g., setDataTree) has already turned them off
+        updates_enabled: bool = self.updatesEnabled()
+        self.setUpdatesEnabled(False)
+        for index in expanded_indexes:
+            self.expand(index)
+        self.setUpdatesEnabled(updates_enabled)
+        # merge rather than replace, as the stored paths may be stale (e.g., TreeView.dropEvent restores the state from before a move)
+        restored_items: set[AbstractTreeItem] = {model.itemFromIndex(index) for index in expanded_indexes}
+        if self._expandedItems is not None:
+            # drop items that are no longer in the tree (e.g., after a model reset)
+            root: AbstractTreeItem = model.root()
+            self._expandedItems = {item for item in self._expandedItems if item.has_ancestor(root)} | restored_items
+        selected_indexes: list[QModelIndex] = [index for index in map(model.indexFromPath, selected_paths) if index.isValid()]
+        # sibling rows in order, so contiguous rows can be selected as one range
+        selected_indexes.sort(key=lambda index: (model.pathFromIndex(index.parent()), index.row()))
+        selection_model: QItemSelectionModel = self.selectionModel()
+        if not selected_indexes:
+            selection_model.clearSelection()
+            return
+        # one range per run of contiguous sibling rows
+        selection: QItemSelection = QItemSelection()
+        first = last = selected_indexes[0]
+        for index in selected_indexes[1:]:
+            if (index.parent() == last.parent()) and (index.row() == last.row() + 1):
+                last = index
+            else:
+                selection.append(QItemSelectionRange(first, last))
+                first = last = index
+        selection.append(QItemSelectionRange(first, last))
+        # clear and select in one step so selectionChanged is emitted once
+        selection_model.select(selection, QItemSelectionModel.SelectionFlag.ClearAndSelect | QItemSelectionModel.SelectionFlag.Rows)
+
     def contextMenu(self, index: QModelIndex = QModelIndex()) -> QMenu:
         menu: QMenu = TreeView.contextMenu(self, index)
 
@@ -80,7 +192,7 @@ class XarrayTreeView(TreeView):
         menu.addAction(self._showCoordsAction)
         menu.addAction(self._showDetailsColumnAction)
         menu.addSeparator()
-        menu.addAction('Refresh', self.refresh)
+        menu.addAction(self._refreshAction)
 
         return menu
     
@@ -93,18 +205,25 @@ class XarrayTreeView(TreeView):
             return
         path: str = model.pathFromItem(item)
         obj = dt[path]
-        text = str(obj)
         
-        textEdit = QTextEdit()
-        textEdit.setPlainText(text)
+        textEdit = QPlainTextEdit()
+        textEdit.setPlainText('Loading...')
         textEdit.setReadOnly(True)
 
+        # the repr of a large (sub)tree can take a while, so build it off the GUI thread
+        task = StrTask(obj, path)
+        task.signals.finished.connect(textEdit.setPlainText)
+        QThreadPool.globalInstance().start(task)
+
         dlg = QDialog(self)
-        dlg.setWindowTitle(item.path)
+        dlg.setWindowTitle(path)
         layout = QVBoxLayout(dlg)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.addWidget(textEdit)
         dlg.exec()
+
+        # the dialog is closed, so the text is no longer needed
+        task.cancel()
     
     def editItemAttrs(self, item: AbstractTreeItem):
         model: XarrayTreeModel = self.model()
@@ -120,12 +239,14 @@ class XarrayTreeView(TreeView):
         root = KeyValueTreeItem('/', attrs)
         kvmodel = KeyValueTreeModel(root)
         view = KeyValueTreeView()
+        view.setUniformRowHeights(True)
         view.setModel(kvmodel)
         view.expandAll()
-        view.resizeAllColumnsToContents()
+        # size the columns once the dialog is up so that it shows without waiting on this
+        QTimer.singleShot(0, view.resizeAllColumnsToContents)
 
         dlg = QDialog(self)
-        dlg.setWindowTitle(item.path)
+        dlg.setWindowTitle(path)
         layout = QVBoxLayout(dlg)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.addWidget(view)
@@ -142,7 +263,7 @@ class XarrayTreeView(TreeView):
             return
         
         attrs = kvmodel.root().value
-        obj.attrs = attrs
+        model.setAttrsAtPath(path, attrs)
         
         self.sigFinishedEditingAttrs.emit()
     
@@ -151,14 +272,18 @@ class XarrayTreeView(TreeView):
     
     def setVariablesVisible(self, visible: bool):
         self._showVarsAction.setChecked(visible)
-        self.refresh()
+        model: XarrayTreeModel = self.model()
+        if model is not None:
+            model.setVariablesVisible(visible)
     
     def isCoordinatesVisible(self) -> bool:
         return self._showCoordsAction.isChecked()
     
     def setCoordinatesVisible(self, visible: bool):
         self._showCoordsAction.setChecked(visible)
-        self.refresh()
+        model: XarrayTreeModel = self.model()
+        if model is not None:
+            model.setCoordinatesVisible(visible)
 
 
 def test_live():
@@ -208,7 +333,8 @@ def test_live():
     view.show()
     view.resize(QSize(600, 600))
     view.expandAll()
-    view.resizeAllColumnsToContents()
+    # the details column is hidden until Show Details Column is checked, and then stretches to fill the view
+    view.resizeColumnToContents(0)
 
     app.exec()
     print(root_node)
@@ -22,12 +22,17 @@ class XarrayTreeViewer(QSplitter):
         model.setDetailsColumnVisible(False)
         self._data_view.setModel(model)
 
-        self._info_view = QTextEdit()
+        self._info_view = QPlainTextEdit()
         self._info_view.setReadOnly(True)
 
+        # path of the item whose repr is shown in the info view
+        self._info_path: str | None = None
+
         self._attrs_view = KeyValueTreeView()
         self._attrs_view.setAlternatingRowColors(True)
-        self._attrs_view.setModel(KeyValueTreeModel())
+        # reused across selections, the view is detached from it while the tabs are cleared
+        self._attrs_model = KeyValueTreeModel()
+        self._attrs_view.setModel(self._attrs_model)
 
         self.metadata_tabs = QTabWidget()
         self.metadata_tabs.addTab(self._info_view, "Info")
@@ -36,8 +41,15 @@ class XarrayTreeViewer(QSplitter):
         self.addWidget(self._data_view)
         self.addWidget(self.metadata_tabs)
 
-        self._data_view.selectionWasChanged.connect(self._on_selection_changed)
-        self._data_view.sigFinishedEditingAttrs.connect(self._on_selection_changed)
+        # update the tabs once the selection settles (e.g., after shift-click or keyboard navigation)
+        self._selection_timer = QTimer(self)
+        self._selection_timer.setSingleShot(True)
+        self._selection_timer.setInterval(50)
+        self._selection_timer.timeout.connect(self._on_selection_changed)
+
+        self._data_view.selectionWasChanged.connect(self._selection_timer.start)
+        # queued so the tabs refresh after the attrs dialog has fully closed
+        self._data_view.sigFinishedEditingAttrs.connect(self._on_selection_changed, Qt.ConnectionType.QueuedConnection)
     
     def view(self) -> XarrayTreeView:
         return self._data_view
@@ -48,6 +60,7 @@ class XarrayTreeViewer(QSplitter):
         dt: DataTree = model.dataTree()
         if (model is None) or (dt is None) or len(selected_items) > 1:
             # clear tabs
+            self._info_path = None
             self._info_view.clear()
             self._attrs_view.setModel(None)
             return
@@ -60,20 +73,23 @@ class XarrayTreeViewer(QSplitter):
 
         path: str = model.pathFromItem(item)
         obj: DataTree | xr.DataArray = dt[path]
-        if isinstance(obj, DataTree):
-            text = str(obj.ds)
-            attrs = obj.attrs
-        elif isinstance(obj, xr.DataArray):
-            text = str(obj)
+        if isinstance(obj, (DataTree, xr.DataArray)):
             attrs = obj.attrs
         else:
-            text = ''
             attrs = None
         
-        self._info_view.setPlainText(text)
+        # the repr is cached by the model or built off the GUI thread (see _on_repr_ready)
+        self._info_path = path
+        self._info_view.setPlainText('Loading...')
+        model.sigReprReady.connect(self._on_repr_ready, Qt.ConnectionType.UniqueConnection)
+        model.requestReprAtPath(path)
+        self._attrs_model.setRoot(KeyValueTreeItem(None, attrs))
         if self._attrs_view.model() is None:
-            self._attrs_view.setModel(KeyValueTreeModel())
-        self._attrs_view.model().setRoot(KeyValueTreeItem(None, attrs))
+            self._attrs_view.setModel(self._attrs_model)
+
+    def _on_repr_ready(self, path: str, text: str) -> None:
+        if path == self._info_path:
+            self._info_view.setPlainText(text)
 
 
 def test_live():
@@ -124,7 +140,7 @@ def test_live():
     viewer.resize(QSize(400, 600))
     viewer.setSizes([300, 300])
     view.expandAll()
-    view.resizeAllColumnsToContents()
+    view.resizeColumnToContents(0)
 
     app.exec()
 
@@ -0,0 +1,28 @@
+import os
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import numpy as np
+import xarray as xr
+from datatree import DataTree
+import pytest
+from qtpy.QtWidgets import QApplication
+
+
+@pytest.fixture(scope='session')
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def tree() -> DataTree:
+    """ root with child nodes c1, c2, c3, each with a child g, which has a child gg.
+
+    Every node has data vars a, b and coord x.
+    """
+    ds = xr.Dataset({'a': ('x', np.arange(3)), 'b': ('x', np.arange(3))}, coords={'x': np.arange(3)})
+    dt = DataTree(name='root', data=ds)
+    for name in ['c1', 'c2', 'c3']:
+        child = DataTree(name=name, data=ds, parent=dt)
+        grandchild = DataTree(name='g', data=ds, parent=child)
+        DataTree(name='gg', data=ds, parent=grandchild)
+    return dt
@@ -0,0 +1,172 @@
+import numpy as np
+import xarray as xr
+from datatree import DataTree
+from qtpy.QtCore import QModelIndex, Qt, qInstallMessageHandler
+from qtpy.QtWidgets import QMessageBox
+from qtpy.QtTest import QAbstractItemModelTester
+from xarray_treeview import XarrayTreeModel
+from xarray_treeview.XarrayTreeModel import StrTask, _parseDatasetDetails
+
+
+def fetch_all(model: XarrayTreeModel, parent_index: QModelIndex = QModelIndex()) -> None:
+    if model.canFetchMore(parent_index):
+        model.fetchMore(parent_index)
+    for row in range(model.rowCount(parent_index)):
+        fetch_all(model, model.index(row, 0, parent_index))
+
+
+def test_model_consistent_across_visibility_toggles(app, tree):
+    messages: list[str] = []
+    previous_handler = qInstallMessageHandler(lambda mode, context, message: messages.append(message))
+    try:
+        model = XarrayTreeModel(tree)
+        tester = QAbstractItemModelTester(model, QAbstractItemModelTester.FailureReportingMode.Warning)
+        fetch_all(model)
+        for set_visible in [model.setVariablesVisible, model.setCoordinatesVisible]:
+            set_visible(False)
+            c = model.itemFromPath('/c1')
+            assert model.indexFromItem(c).row() == c.sibling_index
+            set_visible(True)
+            assert model.indexFromItem(c).row() == c.sibling_index
+    finally:
+        qInstallMessageHandler(previous_handler)
+    assert messages == []
+
+
+def test_path_lookup_fetches_ancestors(app, tree):
+    model = XarrayTreeModel(tree)
+    assert model.canFetchMore(model.indexFromItem(model.itemFromPath('/c1')))
+    item = model.itemFromPath('/c1/g/a')
+    assert item is not None and item.name == 'a'
+    index = model.indexFromPath('/c1/g/a')
+    assert index.isValid() and model.pathFromIndex(index) == '/c1/g/a'
+    assert model.itemFromPath('/c1/g/missing') is None
+    assert not model.indexFromPath('/c1/g/missing').isValid()
+
+
+def test_move_into_unfetched_node(app, tree):
+    dt = tree
+    DataTree(name='v', data=dt['/c1'].to_dataset(), parent=dt)
+    model = XarrayTreeModel(dt)
+    c_index = model.indexFromPath('/c1')
+    fetch_all(model, c_index)
+    src_row = model.itemFromPath('/c1/g').sibling_index
+    # destination row as computed by TreeView.dropEvent for a drop onto an unfetched item
+    dst_index = model.index(model.itemFromPath('/v').sibling_index, 0)
+    assert model.canFetchMore(dst_index)
+    dst_row = model.rowCount(dst_index)
+    assert model.moveRow(c_index, src_row, dst_index, dst_row)
+    fetch_all(model)
+    # vars, coords, then child nodes
+    assert [child.name for child in model.itemFromPath('/v').children] == ['a', 'b', 'x', 'g']
+    assert [child.name for child in model.itemFromPath('/v/g').children] == ['a', 'b', 'x', 'gg']
+    assert list(dt['v'].children) == ['g']
+    assert 'g' not in dt['c1'].children
+
+
+def test_str_task_uses_snapshot(app, tree):
+    dt = tree
+    arr = dt['/c1/a']
+    expected = str(arr)
+    task = StrTask(arr, '/c1/a')
+    results: list[tuple[str, str]] = []
+    task.signals.finished.connect(lambda text, key: results.append((text, key)))
+    # edits after the task is created (e.g., while it waits in the thread pool) are not seen by the task
+    arr.attrs = {'edited': True}
+    assert str(dt['/c1/a']) != expected
+    task.run()
+    assert results == [(expected, '/c1/a')]
+
+
+def parse_details(ds: xr.Dataset) -> dict[str, str]:
+    return _parseDatasetDetails(str(ds), tuple(str(name) for name in ds.variables))
+
+
+def test_parse_details_scalar_coord_and_multidim_var():
+    ds = xr.Dataset({'v': (('x', 'y'), np.zeros((3, 2)))}, coords={'x': np.arange(3), 's': 5})
+    details = parse_details(ds)
+    assert details['x'] == '0 1 2'
+    assert details['s'] == '5'
+    assert details['v'] == '0.0 0.0 0.0 0.0 0.0 0.0'
+
+
+def test_parse_details_names_with_spaces():
+    ds = xr.Dataset({'my var': ('x', np.arange(3)), 'my': ('x', np.arange(3) + 1)})
+    details = parse_details(ds)
+    assert details['my var'] == '0 1 2'
+    assert details['my'] == '1 2 3'
+
+
+def test_parse_details_truncated_section():
+    ds = xr.Dataset({f'v{i}': ('x', np.arange(3)) for i in range(20)}, coords={'x': np.arange(3)})
+    assert 'Data variables: (12/20)' in str(ds)
+    details = parse_details(ds)
+    # xarray only shows the first and last few vars
+    for name in ['v0', 'v5', 'v14', 'v19']:
+        assert details[name] == '0 1 2'
+    assert 'v10' not in details
+    assert details['x'] == '0 1 2'
+
+
+def test_str_task_keeps_parent_in_header(app, tree):
+    dt = tree
+    task = StrTask(dt['/c1'], '/c1')
+    results: list[str] = []
+    task.signals.finished.connect(lambda text, key: results.append(text))
+    task.run()
+    assert results == [str(dt['/c1'])]
+    assert results[0].startswith('DataTree(\'c1\', parent="root")')
+    # the snapshot does not touch the live tree
+    assert dt['/c1'].parent is dt
+
+
+def test_str_task_cancel(app, tree):
+    task = StrTask(tree['/c1'], '/c1')
+    results: list[str] = []
+    task.signals.finished.connect(lambda text, key: results.append(text))
+    task.cancel()
+    task.run()
+    assert results == []
+
+
+def test_rename_checks_hidden_vars_and_coords(app, tree, monkeypatch):
+    warnings: list[str] = []
+    monkeypatch.setattr(QMessageBox, 'warning', lambda parent, title, text: warnings.append(text))
+    model = XarrayTreeModel(tree)
+    model.setVariablesVisible(False)
+    # coord x cannot take the name of hidden var a
+    assert not model.setData(model.indexFromPath('/x'), 'a', Qt.ItemDataRole.EditRole)
+    # node c1 cannot take the name of hidden coord x
+    model.setVariablesVisible(True)
+    model.setCoordinatesVisible(False)
+    assert not model.setData(model.indexFromPath('/c1'), 'x', Qt.ItemDataRole.EditRole)
+    assert len(warnings) == 2
+    assert list(tree.ds.coords) == ['x'] and list(tree.children) == ['c1', 'c2', 'c3']
+    assert model.setData(model.indexFromPath('/c1'), 'c4', Qt.ItemDataRole.EditRole)
+    assert sorted(tree.children) == ['c2', 'c3', 'c4']
+
+
+def test_data_types_and_icons(app, tree):
+    model = XarrayTreeModel(tree)
+    # data types are cached when the items are built, before they are ever looked up
+    assert model._dataTypeCache['/c1'] == 'node'
+    assert [model.dataTypeAtPath(path) for path in ['/c1', '/c1/a', '/c1/x']] == ['node', 'var', 'coord']
+    icons = {data_type: model.data(model.indexFromPath(path), Qt.ItemDataRole.DecorationRole) for data_type, path in [('node', '/c1'), ('var', '/a'), ('coord', '/x')]}
+    assert all(not icon.isNull() for icon in icons.values())
+    # icons are created once per data type and shared
+    assert model.data(model.indexFromPath('/b'), Qt.ItemDataRole.DecorationRole).cacheKey() == icons['var'].cacheKey()
+    assert icons['var'].cacheKey() != icons['coord'].cacheKey()
+    # renaming updates the cached data type
+    assert model.setData(model.indexFromPath('/a'), 'renamed', Qt.ItemDataRole.EditRole)
+    assert model.dataTypeAtPath('/renamed') == 'var' and '/a' not in model._dataTypeCache
+
+
+def test_set_details_column_visible_resets_only_on_change(app, tree):
+    model = XarrayTreeModel(tree)
+    resets: list[bool] = []
+    model.modelReset.connect(lambda: resets.append(model.isDetailsColumnVisible()))
+    model.setDetailsColumnVisible(True)
+    assert resets == [] and model.columnCount() == 2
+    model.setDetailsColumnVisible(False)
+    model.setDetailsColumnVisible(False)
+    assert resets == [False] and model.columnCount() == 1
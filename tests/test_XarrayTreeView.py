@@ -0,0 +1,65 @@
+from datatree import DataTree
+from qtpy.QtCore import QItemSelectionModel, Qt
+from xarray_treeview import XarrayTreeModel, XarrayTreeView
+
+
+def test_refresh_restores_only_stored_state(app, tree):
+    view = XarrayTreeView()
+    view.setModel(XarrayTreeModel(tree))
+    model: XarrayTreeModel = view.model()
+    for path in ['/c1', '/c1/g', '/c3', '/c3/g']:
+        view.expand(model.indexFromPath(path))
+    view.selectionModel().select(model.indexFromPath('/c1/g/a'), QItemSelectionModel.SelectionFlag.Select | QItemSelectionModel.SelectionFlag.Rows)
+    view.refresh()
+    model = view.model()
+    # collapsed subtrees are not fetched
+    assert model.canFetchMore(model.index(model.itemFromPath('/c2').sibling_index, 0))
+    expanded = [path for path in ['/c1', '/c1/g', '/c1/g/gg', '/c2', '/c2/g', '/c3', '/c3/g', '/c3/g/gg'] if view.isExpanded(model.indexFromPath(path))]
+    assert expanded == ['/c1', '/c1/g', '/c3', '/c3/g']
+    assert [model.pathFromItem(item) for item in view.selectedItems()] == ['/c1/g/a']
+
+
+def test_restore_state_keeps_updates_disabled(app, tree):
+    view = XarrayTreeView()
+    view.setModel(XarrayTreeModel(tree))
+    view.expand(view.model().indexFromPath('/c1'))
+    view.storeState()
+    view.setUpdatesEnabled(False)
+    view.restoreState()
+    assert not view.updatesEnabled()
+    view.setUpdatesEnabled(True)
+    view.restoreState()
+    assert view.updatesEnabled()
+
+
+def test_repr_cache_cleared_by_set_data_and_refresh(app, tree):
+    view = XarrayTreeView()
+    view.setModel(XarrayTreeModel(tree))
+    model: XarrayTreeModel = view.model()
+    assert 'a' in model.detailsAtPath('/c1') and 'a ' in model.reprAtPath('/c1')
+    assert model.setData(model.indexFromPath('/c1/a'), 'renamed', Qt.ItemDataRole.EditRole)
+    assert 'renamed' in model.detailsAtPath('/c1') and 'renamed' in model.reprAtPath('/c1')
+    # changes made directly to the data tree are seen after a refresh
+    dt: DataTree = model.dataTree()
+    model.reprAtPath('/c2')
+    dt['/c2'].attrs = {'edited': 'yes'}
+    assert 'edited' not in model.reprAtPath('/c2')
+    view.refresh()
+    assert 'edited' in view.model().reprAtPath('/c2')
+
+
+def test_moved_expanded_subtree_stays_expanded(app, tree):
+    view = XarrayTreeView()
+    view.setModel(XarrayTreeModel(tree))
+    model: XarrayTreeModel = view.model()
+    for path in ['/c1', '/c1/g']:
+        view.expand(model.indexFromPath(path))
+    view.storeState()
+    c1 = model.itemFromPath('/c1')
+    assert model.moveRow(model.parent(model.indexFromItem(c1)), c1.sibling_index, model.indexFromPath('/c3'), 0)
+    # as in TreeView.dropEvent, which restores the state stored before the move
+    view.restoreState()
+    view.refresh()
+    model = view.model()
+    assert view.isExpanded(model.indexFromPath('/c3/c1'))
+    assert view.isExpanded(model.indexFromPath('/c3/c1/g'))